@@ -1,25 +1,61 @@
+import ctypes
 import random
 import sys
-from functools import wraps
+from array import array
 from gc import get_referents
-from itertools import chain
-from time import time
+from time import perf_counter_ns
 from types import ModuleType, FunctionType
 
+import numpy as np
+from numba import int64, njit, uint8, uint64
+from numba.typed import Dict
+from numba.experimental import jitclass
+from numba.types import DictType
 from pympler import asizeof
 
-def timing(cases, capacity):
+RANDOM_BATCH_SIZE = 4096
+
+try:
+    # CPython-only; the presize hint is capped internally at a 128K-slot table
+    _PyDict_NewPresized = ctypes.pythonapi._PyDict_NewPresized
+    _PyDict_NewPresized.argtypes = (ctypes.c_ssize_t,)
+    _PyDict_NewPresized.restype = ctypes.py_object
+except AttributeError:
+    _PyDict_NewPresized = None
+
+
+def presized_dict(capacity: int) -> dict:
+    # empty dict with its hash table presized for `capacity` items, skipping the rehashes while it fills
+    if _PyDict_NewPresized is None:
+        return dict()
+    return _PyDict_NewPresized(capacity)
+
+
+def random_idxes(capacity: int):
+    # endless stream of random indices in [0, capacity), generated by numpy in batches
+    rng = np.random.default_rng(random.getrandbits(64))
+    while True:
+        yield from rng.integers(0, capacity, size=RANDOM_BATCH_SIZE).tolist()
+
+
+def timing(start, cases, capacity):
+    # times the puts of keys [start, cases) into a cache already holding keys [0, start)
     def timing_with_cases(f):
-        @wraps(f)
         def wrap(*args, **kw):
-            ts = time()
-            result = f(*args, **kw)
-            te = time()
             cache = args[0]
-            size = asizeof.asizeof(cache)
-            name = f'{cache.__class__.__name__:<10}(cap={capacity})'
+            replacement_counter = cache._replacement_counter
+            ts = perf_counter_ns()
+            result = f(*args, **kw)
+            te = perf_counter_ns()
+            replacements = cache._replacement_counter - replacement_counter
+            # asizeof only sees the storage of the pure Python caches; jitclass and Cython caches keep theirs natively
+            if type(cache).__module__ == __name__:
+                size = f'{asizeof.asizeof(cache) / cases:.4f}'
+            else:
+                size = 'n/a'
+            name = f'{type(cache).__name__}.{f.__name__}(cap={capacity})'
             print(
-                f'{name:<30}\ttotal puts:{cases},\tper put time (ns):{(te - ts) * 1000 * 1000 / cases:.4f},\treplacement_counter:{cache._replacement_counter},\tper replacement time (ns):{((te - ts) * 1000 * 1000 / cache._replacement_counter) if cache._replacement_counter else 0.0 :.4f}, per item size: {size / cases:.4f}')
+                f'{name:<45}\ttotal puts:{cases},\tper put time (ns):{(te - ts) / (cases - start):.4f},\treplacement_counter:{cache._replacement_counter},\tper replacement time (ns):{((te - ts) / replacements) if replacements else 0.0 :.4f}, per item size: {size}')
             return result
 
         return wrap
@@ -28,10 +64,13 @@ def timing(cases, capacity):
 
 
 class SimpleCache:
+    __slots__ = ('_capacity', '_data', '_replacement_counter', '_random_idxes')
+
     def __init__(self, capacity: int):
         self._capacity = capacity
         self._data = dict()  # key -> value
         self._replacement_counter = 0
+        self._random_idxes = random_idxes(capacity)
 
     def put(self, key, value):
         if key in self._data:
@@ -48,7 +87,7 @@ class SimpleCache:
         del self._data[key]
 
     def _replace(self, key, value):
-        random_idx = random.randint(0, self._capacity - 1)
+        random_idx = next(self._random_idxes)
         random_key = list(self._data.keys())[random_idx]
         del self._data[random_key]
         self.put(key, value)
@@ -59,34 +98,37 @@ class SimpleCache:
 
 
 class OptimizedCache(SimpleCache):
+    __slots__ = ('_idxes', '_available_idxes', '_used_idxes')
+
     def __init__(self, capacity: int):
         super().__init__(capacity)
-        self._data = dict()  # key -> (value, idx)
+        self._data = presized_dict(capacity)  # key -> value
+        self._idxes = presized_dict(capacity)  # key -> idx
         self._available_idxes = set(range(0, capacity))  # {idx}
-        self._used_idxes = dict()  # idx -> key
+        self._used_idxes = presized_dict(capacity)  # idx -> key
 
     def put(self, key, value):
         if key in self._data:
-            self._data[key] = (value, self._data[key][0])
+            self._data[key] = value
         else:
             if self._available_idxes:
                 idx = self._available_idxes.pop()
-                self._data[key] = (value, idx)
+                self._data[key] = value
+                self._idxes[key] = idx
                 self._used_idxes[idx] = key
             else:
                 self._replace(key, value)
 
     def get(self, key):
-        value, _ = self._data[key]
-        return value
+        return self._data[key]
 
     def delete(self, key):
-        _, idx = self._data[key]
+        idx = self._idxes[key]
         self._delete_key(key)
         self._delete_idx(idx)
 
     def _replace(self, key, value):
-        random_idx = random.randint(0, self._capacity - 1)
+        random_idx = next(self._random_idxes)
         random_key = self._used_idxes[random_idx]
         self._delete_idx(random_idx)
         self._delete_key(random_key)
@@ -99,37 +141,44 @@ class OptimizedCache(SimpleCache):
 
     def _delete_key(self, key):
         del self._data[key]
+        del self._idxes[key]
+
+    def __str__(self):
+        return str(self._data)
 
 
 class OptimizedCache2(SimpleCache):
+    __slots__ = ('_idxes', '_available_idxes', '_used_idxes')
+
     def __init__(self, capacity: int):
         super().__init__(capacity)
-        self._data = dict()  # key -> (value, idx)
+        self._data = presized_dict(capacity)  # key -> value
+        self._idxes = presized_dict(capacity)  # key -> idx
         self._available_idxes = list(range(0, capacity))  # [idx3]
-        self._used_idxes = [None for _ in range(capacity)]  # [key1, key2, None]
+        self._used_idxes = [None] * capacity  # [key1, key2, None]
 
     def put(self, key, value):
         if key in self._data:
-            self._data[key] = (value, self._data[key][0])
+            self._data[key] = value
         else:
             if self._available_idxes:
                 idx = self._available_idxes.pop()
-                self._data[key] = (value, idx)
+                self._data[key] = value
+                self._idxes[key] = idx
                 self._used_idxes[idx] = key
             else:
                 self._replace(key, value)
 
     def get(self, key):
-        value, _ = self._data[key]
-        return value
+        return self._data[key]
 
     def delete(self, key):
-        _, idx = self._data[key]
+        idx = self._idxes[key]
         self._delete_key(key)
         self._delete_idx(idx)
 
     def _replace(self, key, value):
-        random_idx = random.randint(0, self._capacity - 1)
+        random_idx = next(self._random_idxes)
         random_key = self._used_idxes[random_idx]
         self._delete_idx(random_idx)
         self._delete_key(random_key)
@@ -142,28 +191,36 @@ class OptimizedCache2(SimpleCache):
 
     def _delete_key(self, key):
         del self._data[key]
+        del self._idxes[key]
+
+    def __str__(self):
+        return str(self._data)
 
 
 class OptimizedCache3(SimpleCache):
+    __slots__ = ('_keys', '_values', '_available_idxes', '_used_idxes')
+
     def __init__(self, capacity: int):
         super().__init__(capacity)
-        self._data = [(None, None) for _ in range(capacity)]  # [(key1, value1), (key2, value2), (None, None)]
+        self._keys = [None] * capacity  # [key1, key2, None]
+        self._values = [None] * capacity  # [value1, value2, None]
         self._available_idxes = list(range(0, capacity))  # [idx3]
-        self._used_idxes = dict()  # key -> idx
+        self._used_idxes = presized_dict(capacity)  # key -> idx
 
     def put(self, key, value):
         if key in self._used_idxes:
-            self._data[self._used_idxes[key]] = (key, value)
+            self._values[self._used_idxes[key]] = value
         else:
             if self._available_idxes:
                 idx = self._available_idxes.pop()
-                self._data[idx] = (key, value)
+                self._keys[idx] = key
+                self._values[idx] = value
                 self._used_idxes[key] = idx
             else:
                 self._replace(key, value)
 
     def get(self, key):
-        return self._data[self._used_idxes[key]][1]
+        return self._values[self._used_idxes[key]]
 
     def delete(self, key):
         idx = self._used_idxes[key]
@@ -172,46 +229,43 @@ class OptimizedCache3(SimpleCache):
 
     def _replace(self, key, value):
 
-        random_idx = random.randint(0, self._capacity - 1)
-        random_key, _ = self._data[random_idx]
+        random_idx = next(self._random_idxes)
+        random_key = self._keys[random_idx]
         self._delete_idx(random_idx)
         self._delete_key(random_key)
         self.put(key, value)
         self._replacement_counter += 1
 
     def _delete_idx(self, idx: int):
-        self._data[idx] = (None, None)
+        self._keys[idx] = None
+        self._values[idx] = None
         self._available_idxes.append(idx)
 
     def _delete_key(self, key):
         del self._used_idxes[key]
 
     def __str__(self):
-        return str({k: v for k, v in self._data if k is not None})
+        return str({k: v for k, v in zip(self._keys, self._values) if k is not None})
 
 
 class OptimizedCache4(SimpleCache):
+    __slots__ = ('_available_idxes', '_used_idxes')
+
     def __init__(self, capacity: int):
         super().__init__(capacity)
-        self._data = dict()
-        def f(capacity):
-            i = 0
-            while i < capacity:
-                yield i
-                i += 1
-
-        self._available_idxes = f(capacity)  # [idx3]
-        self._used_idxes = dict()  # key -> idx
+        self._data = presized_dict(capacity)
+        self._available_idxes = list(range(capacity - 1, -1, -1))  # [idx3], popped from the end as 0, 1, 2, ...
+        self._used_idxes = presized_dict(capacity)  # key -> idx
 
     def put(self, key, value):
         if key in self._used_idxes:
             self._data[self._used_idxes[key]] = (key, value)
         else:
-            try:
-                idx = next(self._available_idxes)
+            if self._available_idxes:
+                idx = self._available_idxes.pop()
                 self._data[idx] = (key, value)
                 self._used_idxes[key] = idx
-            except:
+            else:
                 self._replace(key, value)
 
     def get(self, key):
@@ -224,7 +278,7 @@ class OptimizedCache4(SimpleCache):
 
     def _replace(self, key, value):
 
-        random_idx = random.randint(0, self._capacity - 1)
+        random_idx = next(self._random_idxes)
         random_key, _ = self._data[random_idx]
         self._delete_idx(random_idx)
         self._delete_key(random_key)
@@ -233,7 +287,7 @@ class OptimizedCache4(SimpleCache):
 
     def _delete_idx(self, idx: int):
         del self._data[idx]
-        self._available_idxes = chain(self._available_idxes, (i for i in [idx]))
+        self._available_idxes.append(idx)
 
     def _delete_key(self, key):
         del self._used_idxes[key]
@@ -243,28 +297,23 @@ class OptimizedCache4(SimpleCache):
 
 
 class OptimizedCache5(SimpleCache):
+    __slots__ = ('_available_idxes', '_used_idxes')
+
     def __init__(self, capacity: int):
         super().__init__(capacity)
-        self._data = [(None, None) for _ in range(capacity)]  # [(key1, value1), (key2, value2), (None, None)]
-
-        def f(capacity):
-            i = 0
-            while i < capacity:
-                yield i
-                i += 1
-
-        self._available_idxes = f(capacity)  # [idx3]
-        self._used_idxes = dict()  # key -> idx
+        self._data = [(None, None)] * capacity  # [(key1, value1), (key2, value2), (None, None)]
+        self._available_idxes = list(range(capacity - 1, -1, -1))  # [idx3], popped from the end as 0, 1, 2, ...
+        self._used_idxes = presized_dict(capacity)  # key -> idx
 
     def put(self, key, value):
         if key in self._used_idxes:
             self._data[self._used_idxes[key]] = (key, value)
         else:
-            try:
-                idx = next(self._available_idxes)
+            if self._available_idxes:
+                idx = self._available_idxes.pop()
                 self._data[idx] = (key, value)
                 self._used_idxes[key] = idx
-            except:
+            else:
                 self._replace(key, value)
 
     def get(self, key):
@@ -277,7 +326,7 @@ class OptimizedCache5(SimpleCache):
 
     def _replace(self, key, value):
 
-        random_idx = random.randint(0, self._capacity - 1)
+        random_idx = next(self._random_idxes)
         random_key, _ = self._data[random_idx]
         self._delete_idx(random_idx)
         self._delete_key(random_key)
@@ -286,7 +335,7 @@ class OptimizedCache5(SimpleCache):
 
     def _delete_idx(self, idx: int):
         self._data[idx] = (None, None)
-        self._available_idxes = chain(self._available_idxes, (i for i in [idx]))
+        self._available_idxes.append(idx)
 
     def _delete_key(self, key):
         del self._used_idxes[key]
@@ -295,7 +344,340 @@ class OptimizedCache5(SimpleCache):
         return str({k: v for k, v in self._data if k is not None})
 
 
+class OptimizedCacheMB(SimpleCache):
+    __slots__ = ('_idxes', '_keys')
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self._data = presized_dict(capacity)  # key -> value
+        self._idxes = presized_dict(capacity)  # key -> idx
+        self._keys = []  # [key1, key2]
+
+    def put(self, key, value):
+        if key in self._data:
+            self._data[key] = value
+        elif len(self._data) == self._capacity:
+            # replace a random key in place, inlined to avoid extra calls on the hot path
+            random_idx = next(self._random_idxes)
+            random_key = self._keys[random_idx]
+            self._keys[random_idx] = key
+            del self._data[random_key]
+            del self._idxes[random_key]
+            self._data[key] = value
+            self._idxes[key] = random_idx
+            self._replacement_counter += 1
+        else:
+            self._keys.append(key)
+            self._idxes[key] = len(self._keys) - 1
+            self._data[key] = value
+
+    def get(self, key):
+        return self._data[key]
+
+    def delete(self, key):
+        del self._data[key]
+        idx = self._idxes.pop(key)
+        last_key = self._keys.pop()
+        if idx != len(self._keys):
+            self._keys[idx] = last_key
+            self._idxes[last_key] = idx
+
+
+class IntKeyedCacheMB(OptimizedCacheMB):
+    __slots__ = ()
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self._keys = array('q')  # [key1, key2], int64 keys only, stored unboxed
+
+
+@jitclass([('_capacity', int64),
+           ('_data', DictType(int64, int64)),  # key -> value
+           ('_idxes', DictType(int64, int64)),  # key -> idx
+           ('_keys', int64[:]),  # [key1, key2, ...]
+           ('_size', int64),
+           ('_replacement_counter', int64)])
+class JitCache:
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._data = Dict.empty(int64, int64)
+        self._idxes = Dict.empty(int64, int64)
+        self._keys = np.empty(capacity, dtype=np.int64)
+        self._size = 0
+        self._replacement_counter = 0
+
+    def put(self, key, value):
+        if key in self._data:
+            self._data[key] = value
+        elif self._size == self._capacity:
+            self._replace(key, value)
+        else:
+            self._keys[self._size] = key
+            self._data[key] = value
+            self._idxes[key] = self._size
+            self._size += 1
+
+    def get(self, key):
+        return self._data[key]
+
+    def delete(self, key):
+        idx = self._idxes[key]
+        del self._idxes[key]
+        del self._data[key]
+        self._size -= 1
+        if idx != self._size:
+            last_key = self._keys[self._size]
+            self._keys[idx] = last_key
+            self._idxes[last_key] = idx
+
+    def _replace(self, key, value):
+        random_idx = np.random.randint(0, self._capacity)
+        random_key = self._keys[random_idx]
+        self._keys[random_idx] = key
+        del self._data[random_key]
+        del self._idxes[random_key]
+        self._data[key] = value
+        self._idxes[key] = random_idx
+        self._replacement_counter += 1
+
+
+class TwoRandomCache(OptimizedCacheMB):
+    __slots__ = ('_recent',)
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self._recent = bytearray(capacity)  # [1, 0, 0], set when the key at idx is used
+
+    def put(self, key, value):
+        if key in self._data:
+            self._data[key] = value
+            self._recent[self._idxes[key]] = 1
+        elif len(self._data) == self._capacity:
+            self._replace(key, value)
+        else:
+            self._keys.append(key)
+            self._idxes[key] = len(self._keys) - 1
+            self._data[key] = value
+
+    def get(self, key):
+        value = self._data[key]
+        self._recent[self._idxes[key]] = 1
+        return value
+
+    def delete(self, key):
+        del self._data[key]
+        idx = self._idxes.pop(key)
+        last_key = self._keys.pop()
+        last_idx = len(self._keys)
+        if idx != last_idx:
+            self._keys[idx] = last_key
+            self._idxes[last_key] = idx
+            self._recent[idx] = self._recent[last_idx]
+        self._recent[last_idx] = 0
+
+    def _replace(self, key, value):
+        # sample two slots and evict one whose key was not used recently
+        i = next(self._random_idxes)
+        j = next(self._random_idxes)
+        if not self._recent[i]:
+            random_idx = i
+        elif not self._recent[j]:
+            random_idx = j
+        else:
+            random_idx = j
+            self._recent[i] = 0
+        self._recent[random_idx] = 0
+        random_key = self._keys[random_idx]
+        self._keys[random_idx] = key
+        del self._data[random_key]
+        del self._idxes[random_key]
+        self._data[key] = value
+        self._idxes[key] = random_idx
+        self._replacement_counter += 1
+
+
+_EMPTY = np.iinfo(np.int64).min  # marks a free slot in IntKeyedRandomCache
+
+
+@jitclass([('_capacity', int64),
+           ('_keys', int64[:]),  # [key1, _EMPTY, key2, ...], open addressing with linear probing
+           ('_values', int64[:]),  # [value1, 0, value2, ...]
+           ('_shift', uint64),
+           ('_size', int64),
+           ('_replacement_counter', int64)])
+class IntKeyedRandomCache:
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self._capacity = capacity
+        # a power-of-two table of at least twice the capacity keeps the load factor at most 0.5
+        bits = 1
+        while (1 << bits) < 2 * capacity:
+            bits += 1
+        self._shift = np.uint64(64 - bits)
+        self._keys = np.full(1 << bits, _EMPTY, dtype=np.int64)
+        self._values = np.zeros(1 << bits, dtype=np.int64)
+        self._size = 0
+        self._replacement_counter = 0
+
+    def put(self, key, value):
+        if key == _EMPTY:
+            raise ValueError('int64 min is reserved for free slots')
+        slot = self._find_slot(key)
+        if self._keys[slot] != key:
+            if self._size == self._capacity:
+                self._replace()
+                slot = self._find_slot(key)
+            self._keys[slot] = key
+            self._size += 1
+        self._values[slot] = value
+
+    def get(self, key):
+        slot = self._find_slot(key)
+        if key == _EMPTY or self._keys[slot] != key:
+            raise KeyError('key not found')
+        return self._values[slot]
+
+    def delete(self, key):
+        slot = self._find_slot(key)
+        if key == _EMPTY or self._keys[slot] != key:
+            raise KeyError('key not found')
+        self._delete_slot(slot)
+
+    def _replace(self):
+        # rejection-sample an occupied slot; at most half the table is empty
+        random_idx = np.random.randint(0, len(self._keys))
+        while self._keys[random_idx] == _EMPTY:
+            random_idx = np.random.randint(0, len(self._keys))
+        self._delete_slot(random_idx)
+        self._replacement_counter += 1
+
+    def _home(self, key):
+        # Fibonacci hashing, so runs of consecutive keys do not form one long cluster
+        return np.int64((np.uint64(key) * np.uint64(0x9E3779B97F4A7C15)) >> self._shift)
+
+    def _find_slot(self, key):
+        # slot holding key, or the empty slot where key would be inserted
+        n = len(self._keys)
+        slot = self._home(key)
+        while self._keys[slot] != _EMPTY and self._keys[slot] != key:
+            slot = (slot + 1) % n
+        return slot
+
+    def _delete_slot(self, slot):
+        # backward-shift deletion, so later keys in the probe chain stay reachable
+        n = len(self._keys)
+        i = slot
+        j = slot
+        while True:
+            j = (j + 1) % n
+            if self._keys[j] == _EMPTY:
+                break
+            home = self._home(self._keys[j])
+            if (i < home <= j) if i <= j else (home > i or home <= j):
+                continue
+            self._keys[i] = self._keys[j]
+            self._values[i] = self._values[j]
+            i = j
+        self._keys[i] = _EMPTY
+        self._size -= 1
+
+
+_NO_SLOT = 255  # flag of the lanes past the capacity in the last block of AoSoACache
+
+
+@jitclass([('_capacity', int64),
+           ('_slots', DictType(int64, int64)),  # key -> slot, slot i lives at [i >> 3, i & 7]
+           ('_block_keys', int64[:, :]),  # [[key1, ..., key8], [key9, ...]]
+           ('_block_values', int64[:, :]),  # [[value1, ..., value8], [value9, ...]]
+           ('_block_flags', uint8[:, :]),  # [[1, 0, ...], ...], set when the key in the slot is used
+           ('_size', int64),
+           ('_replacement_counter', int64)])
+class AoSoACache:
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._slots = Dict.empty(int64, int64)
+        # blocks of 8 slots: the keys (or values, or flags) of a block sit next to each other in memory
+        blocks = (capacity + 7) >> 3
+        self._block_keys = np.empty((blocks, 8), dtype=np.int64)
+        self._block_values = np.empty((blocks, 8), dtype=np.int64)
+        self._block_flags = np.zeros((blocks, 8), dtype=np.uint8)
+        for lane in range(capacity - ((blocks - 1) << 3), 8):
+            self._block_flags[blocks - 1, lane] = _NO_SLOT
+        self._size = 0
+        self._replacement_counter = 0
+
+    def put(self, key, value):
+        if key in self._slots:
+            slot = self._slots[key]
+            self._block_values[slot >> 3, slot & 7] = value
+            self._block_flags[slot >> 3, slot & 7] = 1
+        elif self._size == self._capacity:
+            self._replace(key, value)
+        else:
+            self._set_slot(self._size, key, value)
+            self._size += 1
+
+    def get(self, key):
+        slot = self._slots[key]
+        self._block_flags[slot >> 3, slot & 7] = 1
+        return self._block_values[slot >> 3, slot & 7]
+
+    def delete(self, key):
+        slot = self._slots[key]
+        del self._slots[key]
+        self._size -= 1
+        last = self._size
+        if slot != last:
+            last_key = self._block_keys[last >> 3, last & 7]
+            self._block_keys[slot >> 3, slot & 7] = last_key
+            self._block_values[slot >> 3, slot & 7] = self._block_values[last >> 3, last & 7]
+            self._block_flags[slot >> 3, slot & 7] = self._block_flags[last >> 3, last & 7]
+            self._slots[last_key] = slot
+        self._block_flags[last >> 3, last & 7] = 0
+
+    def _replace(self, key, value):
+        # sample a random block and evict the first unused slot of the block, scanning from a random lane;
+        # if all are used, clear the block and evict that random lane
+        block = np.random.randint(0, len(self._block_flags))
+        flags = self._block_flags[block]
+        lanes = min(8, self._capacity - (block << 3))
+        offset = np.random.randint(0, lanes)
+        lane = -1
+        for i in range(lanes):
+            if not flags[(offset + i) % lanes]:
+                lane = (offset + i) % lanes
+                break
+        if lane < 0:
+            for i in range(lanes):
+                flags[i] = 0
+            lane = offset
+        del self._slots[self._block_keys[block, lane]]
+        self._set_slot((block << 3) + lane, key, value)
+        self._replacement_counter += 1
+
+    def _set_slot(self, slot, key, value):
+        self._block_keys[slot >> 3, slot & 7] = key
+        self._block_values[slot >> 3, slot & 7] = value
+        self._block_flags[slot >> 3, slot & 7] = 0
+        self._slots[key] = slot
+
+
+@njit(cache=True)
+def jit_ordered_inputs(c, start, cases):
+    for i in range(start, cases):
+        c.put(i, i)
+
+
 if __name__ == '__main__':
+    # the Cython cache is optional: it needs Cython and a C compiler to build
+    try:
+        import pyximport
+        pyximport.install(language_level=3)
+        from random_cache_cy import CythonCache
+    except ImportError:
+        CythonCache = None
+
     # correctness check:
 
     o = OptimizedCache5(3)
@@ -316,26 +698,98 @@ if __name__ == '__main__':
     # print(o._used_idxes)
     print(o.get(6))
 
+    def held_items(c, keys):
+        held = {}
+        for k in keys:
+            try:
+                held[k] = c.get(k)
+            except KeyError:
+                pass
+        return held
+
+    def first_slot_key(c, held):
+        # the key in slot 0 is not in the last of the 3 slots, so delete has to move the last key into its place
+        if isinstance(c, IntKeyedRandomCache):
+            return min(held)  # open addressing has no slot order to keep
+        if isinstance(c, AoSoACache):
+            return c._block_keys[0, 0]
+        return c._keys[0]
+
+    caches = [OptimizedCacheMB(3), IntKeyedCacheMB(3), TwoRandomCache(3), JitCache(3), IntKeyedRandomCache(3),
+              AoSoACache(3)]
+    if CythonCache is not None:
+        caches.append(CythonCache(3))
+    for c in caches:
+        for i in range(1, 6):
+            c.put(i, i * 10)
+        held = held_items(c, range(1, 6))
+        assert c._replacement_counter == 2 and len(held) == 3 and held[5] == 50, type(c).__name__
+        assert all(v == k * 10 for k, v in held.items()), type(c).__name__
+        deleted = int(first_slot_key(c, held))
+        c.delete(deleted)
+        held = held_items(c, range(1, 6))
+        assert len(held) == 2 and deleted not in held, type(c).__name__
+        c.put(6, 60)
+        c.put(6, 61)
+        c.put(7, 70)
+        held = held_items(c, range(1, 8))
+        assert c._replacement_counter == 3 and len(held) == 3, type(c).__name__
+        assert held[7] == 70 and held.get(6, 61) == 61, type(c).__name__
+        print(f'{type(c).__name__}: {held}')
+    try:
+        IntKeyedRandomCache(3).put(_EMPTY, 0)
+        raise AssertionError('IntKeyedRandomCache accepted the free-slot sentinel as a key')
+    except ValueError:
+        pass
+
+    # with no gets, every slot is unused, so a put-only stream has to evict the first keys from all lanes
+    for c in (TwoRandomCache(1000), AoSoACache(1000)):
+        for i in range(50000):
+            c.put(i, i)
+        assert not held_items(c, range(1000)), type(c).__name__
+
     # performance
 
+    # compile once, outside of the timed runs
+    jit_ordered_inputs(JitCache(1), 0, 2)
+    jit_ordered_inputs(IntKeyedRandomCache(1), 0, 2)
+    jit_ordered_inputs(AoSoACache(1), 0, 2)
 
-    for exp_c in range(3, 10):
+    # capacities above 10 ** 7 do not fit in memory for the slower layouts
+    for exp_c in range(3, 8):
         capacity = 10 ** exp_c
-        for exp in range(0, 20):
+        simple_c = SimpleCache(capacity)
+        optimized_c = OptimizedCache(capacity)
+        optimized2_c = OptimizedCache2(capacity)
+        optimized3_c = OptimizedCache3(capacity)
+        optimized4_c = OptimizedCache4(capacity)
+        optimized5_c = OptimizedCache5(capacity)
+        optimized_mb_c = OptimizedCacheMB(capacity)
+        int_keyed_mb_c = IntKeyedCacheMB(capacity)
+        two_random_c = TwoRandomCache(capacity)
+        jit_c = JitCache(capacity)
+        int_keyed_c = IntKeyedRandomCache(capacity)
+        aosoa_c = AoSoACache(capacity)
+        cython_c = CythonCache(capacity) if CythonCache is not None else None
+        cython_batch_c = CythonCache(capacity) if CythonCache is not None else None
+
+        # the caches are filled incrementally: each step only puts the keys added since the previous one
+        start = 0
+        for exp in range(0, 20, 2):
             cases = 2 ** exp
-            simple_c = SimpleCache(capacity)
-            optimized_c = OptimizedCache(capacity)
-            optimized2_c = OptimizedCache2(capacity)
-            optimized3_c = OptimizedCache3(capacity)
-            optimized4_c = OptimizedCache4(capacity)
-            optimized5_c = OptimizedCache5(capacity)
 
-
-            @timing(cases, capacity)
+            @timing(start, cases, capacity)
             def ordered_inputs(c):
-                for i in range(cases):
+                for i in range(start, cases):
                     c.put(i, i)
 
+            @timing(start, cases, capacity)
+            def batch_inputs(c):
+                c.put_many(range(start, cases), range(start, cases))
+
+            @timing(start, cases, capacity)
+            def jit_inputs(c):
+                jit_ordered_inputs(c, start, cases)
 
             ordered_inputs(simple_c)
             ordered_inputs(optimized_c)
@@ -343,6 +797,16 @@ if __name__ == '__main__':
             ordered_inputs(optimized3_c)
             ordered_inputs(optimized4_c)
             ordered_inputs(optimized5_c)
+            ordered_inputs(optimized_mb_c)
+            ordered_inputs(int_keyed_mb_c)
+            ordered_inputs(two_random_c)
+            if CythonCache is not None:
+                ordered_inputs(cython_c)
+                batch_inputs(cython_batch_c)
+            jit_inputs(jit_c)
+            jit_inputs(int_keyed_c)
+            jit_inputs(aosoa_c)
+            start = cases
 
             print("-------------------------------------------------------------------------\n")
         print("\n\n\n==================================================================\n")
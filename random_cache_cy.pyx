@@ -0,0 +1,62 @@
+from libc.stdlib cimport rand, srand
+from libc.time cimport time
+
+
+cdef extern from "Python.h":
+    # same presizing as presized_dict in random_cache.py
+    dict _PyDict_NewPresized(Py_ssize_t minused)
+
+srand(<unsigned int> time(NULL))
+
+
+cdef class CythonCache:
+    cdef Py_ssize_t _capacity
+    cdef readonly Py_ssize_t _replacement_counter
+    cdef dict _data  # key -> value
+    cdef dict _idxes  # key -> idx
+    cdef readonly list _keys  # [key1, key2]
+
+    def __init__(self, Py_ssize_t capacity):
+        self._capacity = capacity
+        self._data = _PyDict_NewPresized(capacity)
+        self._idxes = _PyDict_NewPresized(capacity)
+        self._keys = []
+        self._replacement_counter = 0
+
+    cpdef void put(self, object key, object value):
+        if key in self._data:
+            self._data[key] = value
+        elif len(self._data) == self._capacity:
+            self._replace(key, value)
+        else:
+            self._keys.append(key)
+            self._idxes[key] = len(self._keys) - 1
+            self._data[key] = value
+
+    cpdef void put_many(self, object keys, object values):
+        for key, value in zip(keys, values):
+            self.put(key, value)
+
+    cpdef object get(self, object key):
+        return self._data[key]
+
+    cpdef void delete(self, object key):
+        cdef Py_ssize_t idx = self._idxes.pop(key)
+        del self._data[key]
+        last_key = self._keys.pop()
+        if idx != len(self._keys):
+            self._keys[idx] = last_key
+            self._idxes[last_key] = idx
+
+    cdef void _replace(self, object key, object value):
+        cdef Py_ssize_t random_idx = rand() % self._capacity
+        random_key = self._keys[random_idx]
+        self._keys[random_idx] = key
+        del self._data[random_key]
+        del self._idxes[random_key]
+        self._data[key] = value
+        self._idxes[key] = random_idx
+        self._replacement_counter += 1
+
+    def __str__(self):
+        return str(self._data)